@@ -1,10 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends
 from typing import List, Optional
 from api.controllers.trading_controller import TradingController
-from pydantic import BaseModel
+from api.controllers.forecast_controller import ForecastController
+from pydantic import BaseModel, Field
 
 router = APIRouter()
 controller = TradingController()
+forecast_controller = ForecastController()
 
 class OrderRequest(BaseModel):
     contract_code: str
@@ -19,6 +21,11 @@ class OrderResponse(BaseModel):
     status: str
     message: str
 
+class ExecuteRequest(BaseModel):
+    contract_code: str
+    horizon_days: int = 7
+    quantity: int = Field(gt=0)
+
 @router.post("/order", response_model=OrderResponse)
 async def place_order(request: OrderRequest):
     try:
@@ -33,6 +40,79 @@ async def place_order(request: OrderRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/execute")
+async def execute_forecast_trade(request: ExecuteRequest):
+    """
+    Forecast, validate, place a market order on the forecast's side and
+    report the portfolio, all in one round trip
+    """
+    try:
+        forecast = await forecast_controller.generate_forecast(
+            contract_code=request.contract_code,
+            horizon_days=request.horizon_days,
+            include_embeddings=True,
+            include_news_sentiment=True
+        )
+        
+        predicted_prices = forecast["predicted_prices"]
+        if not predicted_prices:
+            # No forecast means no basis for a side; never trade blind
+            raise HTTPException(
+                status_code=503,
+                detail="Forecast returned no predicted prices; no order placed"
+            )
+        
+        side = "BUY" if predicted_prices[0]["price"] > forecast["current_price"] else "SELL"
+        estimated_cost = request.quantity * forecast["current_price"]
+        
+        # Check the order against the live account before placing it
+        account = await controller.get_account()
+        if account.get("status") == "ERROR" or "error" in account:
+            # An unreadable account cannot be validated; never trade unchecked
+            raise HTTPException(
+                status_code=503,
+                detail=f"Account unavailable; no order placed: {account.get('error', 'unknown error')}"
+            )
+        errors = []
+        if account.get("trading_blocked") or account.get("account_blocked"):
+            errors.append("Account is blocked from trading")
+        if side == "BUY" and estimated_cost > account.get("buying_power", 0):
+            errors.append(
+                f"Estimated cost ${estimated_cost:,.2f} exceeds buying power "
+                f"${account.get('buying_power', 0):,.2f}"
+            )
+        validation = {
+            "is_valid": not errors,
+            "errors": errors,
+            "side": side,
+            "quantity": request.quantity,
+            "estimated_cost": estimated_cost,
+            "buying_power": account.get("buying_power", 0)
+        }
+        if errors:
+            raise HTTPException(status_code=400, detail=validation)
+        
+        order = await controller.place_order(
+            contract_code=request.contract_code,
+            side=side,
+            quantity=request.quantity,
+            order_type="market",
+            limit_price=None,
+            stop_price=None
+        )
+        portfolio = await controller.get_portfolio_status()
+        
+        return {
+            "forecast": forecast,
+            "validation": validation,
+            "order": order,
+            "portfolio": portfolio
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/account")
 async def get_account():
     try:
@@ -9,6 +9,7 @@ from fastapi.testclient import TestClient
 import sys
 import os
 from datetime import datetime
+from unittest.mock import patch, AsyncMock
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -201,6 +202,28 @@ class TestAPIIntegration:
         assert "positions" in data
         assert "cash_balance" in data
     
+    def test_execute_forecast_trade(self, client):
+        """Test forecast, validation, order and portfolio in one call"""
+        response = client.post(
+            "/api/v1/trading/execute",
+            json={
+                "contract_code": "NQH25",
+                "horizon_days": 7,
+                "quantity": 5
+            }
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert "predicted_prices" in data["forecast"]
+        validation = data["validation"]
+        assert validation["side"] in ("BUY", "SELL")
+        # A placed BUY must have been covered by the account's buying power
+        if validation["side"] == "BUY":
+            assert validation["estimated_cost"] <= validation["buying_power"]
+        assert "order_id" in data["order"]
+        assert "total_value" in data["portfolio"]
+    
     # ==================== Chat & Agent Tests ====================
     
     def test_chat_endpoint(self, client):
@@ -332,6 +355,51 @@ class TestAPIErrorHandling:
         
         assert response.status_code in [400, 422]
     
+    def test_execute_rejects_invalid_quantity(self, client):
+        """Test the composite trade endpoint refuses to trade a bad quantity"""
+        response = client.post(
+            "/api/v1/trading/execute",
+            json={
+                "contract_code": "NQH25",
+                "quantity": 0
+            }
+        )
+        
+        assert response.status_code in [400, 422]
+    
+    def test_execute_refuses_unreadable_account(self, client):
+        """Test the composite trade endpoint places no order when the account cannot be read"""
+        from api.routes import trading
+        
+        # A falling forecast picks SELL, which skips the buying power check
+        forecast = {
+            "current_price": 500.0,
+            "predicted_prices": [{"date": "2025-01-02", "price": 490.0}]
+        }
+        account_error = {
+            "portfolio_value": 0.00,
+            "cash": 0.00,
+            "buying_power": 0.00,
+            "status": "ERROR",
+            "error": "connection refused",
+            "message": "Unable to fetch account data from Alpaca"
+        }
+        with patch.object(trading.forecast_controller, "generate_forecast",
+                          AsyncMock(return_value=forecast)), \
+             patch.object(trading.controller, "get_account",
+                          AsyncMock(return_value=account_error)), \
+             patch.object(trading.controller, "place_order", AsyncMock()) as place_order:
+            response = client.post(
+                "/api/v1/trading/execute",
+                json={
+                    "contract_code": "NQH25",
+                    "quantity": 1
+                }
+            )
+        
+        assert response.status_code == 503
+        place_order.assert_not_called()
+    
     def test_missing_required_fields(self, client):
         """Test handling of missing required fields"""
         response = client.post(
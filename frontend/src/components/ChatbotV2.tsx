@@ -262,6 +262,7 @@ const ChatbotV2: React.FC = () => {
       {/* Chat Button */}
       {!open && (
         <Fab
+          data-testid="chat-button"
           color="secondary"
           sx={{
             position: 'fixed',
@@ -283,6 +284,8 @@ const ChatbotV2: React.FC = () => {
       {/* Chat Window */}
       <Collapse in={open}>
         <Paper
+          data-testid="chat-panel"
+          data-open={open ? 'true' : 'false'}
           elevation={8}
           sx={{
             position: 'fixed',
@@ -312,7 +315,12 @@ const ChatbotV2: React.FC = () => {
                 Water Futures {agentMode ? 'AGENT' : 'Assistant'}
               </Typography>
             </Box>
-            <IconButton size="small" onClick={() => setOpen(false)} sx={{ color: 'white' }}>
+            <IconButton
+              size="small"
+              onClick={() => setOpen(false)}
+              sx={{ color: 'white' }}
+              data-testid="chat-close"
+            >
               <CloseIcon />
             </IconButton>
           </Box>
@@ -401,6 +409,7 @@ const ChatbotV2: React.FC = () => {
                     {message.sender === 'user' ? 'F' : <BotIcon />}
                   </Avatar>
                   <Paper
+                    data-testid="message-bubble"
                     sx={{
                       p: 2,
                       maxWidth: '75%',
@@ -620,7 +629,7 @@ const ChatbotV2: React.FC = () => {
           </Alert>
         </DialogContent>
         <DialogActions>
-          <Button onClick={cancelAgentMode} color="primary" variant="contained">
+          <Button onClick={cancelAgentMode} color="primary" variant="contained" data-testid="agent-warning-cancel">
             Cancel (Stay Safe)
           </Button>
           <Button onClick={confirmAgentMode} color="error" variant="outlined">
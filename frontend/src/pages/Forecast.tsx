@@ -67,7 +67,7 @@ const Forecast: React.FC = () => {
   }));
 
   return (
-    <Box>
+    <Box data-testid="forecast-page">
       <Typography variant="h4" gutterBottom>
         Water Futures Forecast
       </Typography>
@@ -83,6 +83,7 @@ const Forecast: React.FC = () => {
               <TextField
                 fullWidth
                 label="Contract Code"
+                name="forecast_contract"
                 value={contractCode}
                 onChange={(e) => setContractCode(e.target.value)}
                 margin="normal"
@@ -91,6 +92,7 @@ const Forecast: React.FC = () => {
               <TextField
                 fullWidth
                 label="Forecast Horizon (days)"
+                name="forecast_period"
                 type="number"
                 value={horizonDays}
                 onChange={(e) => setHorizonDays(parseInt(e.target.value))}
@@ -104,6 +106,7 @@ const Forecast: React.FC = () => {
                 onClick={generateForecast}
                 disabled={loading}
                 sx={{ mt: 2 }}
+                data-testid="generate-forecast"
               >
                 {loading ? <CircularProgress size={24} /> : 'Generate Forecast'}
               </Button>
@@ -111,19 +114,19 @@ const Forecast: React.FC = () => {
           </Card>
 
           {forecast && (
-            <Card sx={{ mt: 2 }}>
+            <Card sx={{ mt: 2 }} data-testid="forecast-results">
               <CardContent>
                 <Typography variant="h6" gutterBottom>
                   Model Confidence
                 </Typography>
-                <Typography variant="h4" color="primary">
+                <Typography variant="h4" color="primary" data-testid="forecast-confidence">
                   {(forecast.modelConfidence * 100).toFixed(1)}%
                 </Typography>
                 
                 <Typography variant="subtitle2" sx={{ mt: 2 }}>
                   Current Price
                 </Typography>
-                <Typography variant="h5">
+                <Typography variant="h5" data-testid="forecast-current-price">
                   ${forecast.currentPrice.toFixed(2)}
                 </Typography>
               </CardContent>
@@ -139,7 +142,7 @@ const Forecast: React.FC = () => {
           )}
 
           {forecast && chartData && (
-            <Card>
+            <Card data-testid="forecast-predicted">
               <CardContent>
                 <Typography variant="h6" gutterBottom>
                   Price Forecast
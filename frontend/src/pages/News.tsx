@@ -59,11 +59,11 @@ const News: React.FC = () => {
         Water Market News
       </Typography>
 
-      <Card>
+      <Card data-testid="news-container">
         <CardContent>
           <List>
             {news.map((item, index) => (
-              <ListItem key={index} alignItems="flex-start">
+              <ListItem key={index} alignItems="flex-start" data-testid="news-article">
                 <ListItemText
                   primary={
                     <Box>
@@ -79,6 +79,7 @@ const News: React.FC = () => {
                           sx={{ mr: 1 }}
                         />
                         <Chip 
+                          data-testid="sentiment-badge"
                           label={getSentimentLabel(item.sentimentScore)} 
                           size="small" 
                           color={getSentimentColor(item.sentimentScore) as any}
@@ -360,7 +360,7 @@ const Trading: React.FC = () => {
   };
 
   return (
-    <Box>
+    <Box data-testid="trading-page">
       <Typography variant="h4" gutterBottom>
         Water Futures Trading Dashboard
       </Typography>
@@ -480,6 +480,7 @@ const Trading: React.FC = () => {
               <TextField
                 fullWidth
                 label="Contract Code"
+                name="contract"
                 value={contractCode}
                 onChange={(e) => setContractCode(e.target.value)}
                 margin="normal"
@@ -505,6 +506,7 @@ const Trading: React.FC = () => {
               <TextField
                 fullWidth
                 label="Quantity"
+                name="quantity"
                 type="number"
                 value={quantity}
                 onChange={(e) => setQuantity(parseInt(e.target.value))}
@@ -519,6 +521,7 @@ const Trading: React.FC = () => {
                 onClick={handlePlaceOrder}
                 disabled={loading || balanceLoading}
                 sx={{ mt: 2 }}
+                data-testid="place-order"
               >
                 {loading ? 'Processing...' : `Place ${side} Order (Using Trading Funds)`}
               </Button>
@@ -532,7 +535,7 @@ const Trading: React.FC = () => {
         </Grid>
 
         <Grid size={{ xs: 12, md: 6 }}>
-          <Card>
+          <Card data-testid="portfolio">
             <CardContent>
               <Typography variant="h6" gutterBottom>
                 Alpaca Portfolio Summary
@@ -543,7 +546,7 @@ const Trading: React.FC = () => {
                   <Typography color="textSecondary" variant="subtitle2">
                     Portfolio Value (USD)
                   </Typography>
-                  <Typography variant="h6">
+                  <Typography variant="h6" data-testid="portfolio-value">
                     ${balance?.tradingAccount.portfolio_value?.toLocaleString() || '0'}
                   </Typography>
                 </Grid>
@@ -551,7 +554,7 @@ const Trading: React.FC = () => {
                   <Typography color="textSecondary" variant="subtitle2">
                     Cash Balance (USD)
                   </Typography>
-                  <Typography variant="h6">
+                  <Typography variant="h6" data-testid="cash-balance">
                     ${balance?.tradingAccount.cash?.toLocaleString() || '0'}
                   </Typography>
                 </Grid>
@@ -729,7 +732,12 @@ const Trading: React.FC = () => {
         autoHideDuration={6000}
         onClose={() => setOrderStatus(null)}
       >
-        <Alert severity={orderStatus?.type || 'info'} onClose={() => setOrderStatus(null)}>
+        <Alert
+          severity={orderStatus?.type || 'info'}
+          onClose={() => setOrderStatus(null)}
+          data-testid="order-toast"
+          data-status={orderStatus?.type}
+        >
           {orderStatus?.message || ''}
         </Alert>
       </Snackbar>
@@ -101,7 +101,7 @@ install_dependencies() {
         python3 -m venv venv
     fi
     source venv/bin/activate
-    pip install -q pytest pytest-asyncio pytest-cov httpx selenium 2>/dev/null || true
+    pip install -q pytest pytest-asyncio pytest-cov pytest-xdist httpx selenium 2>/dev/null || true
     deactivate
     cd ..
     
@@ -163,10 +163,13 @@ run_integration_tests() {
 # Run end-to-end tests
 run_e2e_tests() {
     if check_services; then
+        # pytest-xdist (-n) is only installed in the backend venv
+        source backend/venv/bin/activate
         run_test_suite \
             "End-to-End Tests" \
-            "python tests/test_e2e.py" \
+            "python -m pytest tests/test_e2e.py -n auto --dist=loadgroup -q" \
             "e2e"
+        deactivate
     fi
 }
 
@@ -5,12 +5,23 @@ Tests the full flow: Frontend → Backend → Vertex AI → MCP → Trading/Subs
 """
 
 import asyncio
+import contextvars
 import httpx
+import io
 import json
-import subprocess
+import re
+import sys
 import time
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:  # orjson is optional; the stdlib codec is just slower
+    from json import loads as json_loads
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
 
 # ANSI colors for output
 RED = '\033[0;31m'
@@ -22,16 +33,63 @@ CYAN = '\033[0;36m'
 NC = '\033[0m'  # No Color
 BOLD = '\033[1m'
 
+# Result labels are fixed, so build them once
+PASSED = f"{GREEN}✅ PASSED{NC}"
+FAILED = f"{RED}❌ FAILED{NC}"
+
 # Configuration
 BACKEND_URL = "http://localhost:8000"
 FRONTEND_URL = "http://localhost:5173"
 MCP_URL = "http://localhost:8080"
 CHAT_SERVICE_URL = "http://localhost:8001"
 
+# Retries allowed when the backend answers 429 Too Many Requests
+MAX_RATE_LIMIT_RETRIES = 5
+DEFAULT_RETRY_AFTER = 0.2  # seconds
+HEALTH_CHECK_TIMEOUT = 2.0  # seconds
+JSON_HEADERS = {"content-type": "application/json"}
+
+# Keyword checks run against lowercased responses; one pass per alternation
+PRICE_TERMS = re.compile(r"price|forecast|predict")
+FORECAST_TERMS = re.compile(r"forecast|predict|expect|likely")
+TRADE_TERMS = re.compile(r"trade|order")
+
+# Output buffer and results of the phase running in the current task
+_current_phase: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "current_phase", default=None
+)
+
+# Shared client, so repeated suite runs in one process reuse a warm pool
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it on first use"""
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=60,
+            ),
+        )
+    return _CLIENT
+
+async def close_client():
+    """Close the shared AsyncClient; the next get_client() builds a fresh one"""
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
 class E2ETestSuite:
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.client = get_client()
         self.test_results = []
+        self._passed_count = 0
+        self._failed_names: List[str] = []
+        self._buf = io.StringIO()
         self.session_context = {
             "location": "Central Valley",
             "farmSize": 500,
@@ -39,26 +97,106 @@ class E2ETestSuite:
             "droughtSeverity": 4,
             "farmer_id": "farmer-ted"
         }
+        # Endpoints and per-mode contexts are fixed for the whole run
+        self._chat_url = f"{BACKEND_URL}/api/v1/chat"
+        self._agent_url = f"{BACKEND_URL}/api/v1/agent/execute"
+        self._chat_ctx = {**self.session_context, "agentModeEnabled": False}
+        self._agent_ctx = {**self.session_context, "agentModeEnabled": True}
     
     async def __aenter__(self):
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
+        # The client is shared; whoever owns the process closes it
+        self.flush()
+    
+    async def _request(self, method: str, url: str, **kwargs) -> Tuple[int, Dict[str, Any]]:
+        """Send a request on the shared client and decode its JSON body"""
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            response = await self.client.request(method, url, **kwargs)
+            if response.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                break
+            # Only wait when the backend actually asks us to slow down
+            try:
+                retry_after = float(response.headers.get("Retry-After", DEFAULT_RETRY_AFTER))
+            except ValueError:
+                retry_after = DEFAULT_RETRY_AFTER
+            await asyncio.sleep(retry_after)
+        
+        try:
+            body = json_loads(response.content)
+        except ValueError:
+            body = {}
+        return response.status_code, body
+    
+    def log(self, text: str = ""):
+        """Buffer a line of output for the current phase"""
+        phase = _current_phase.get()
+        out = self._buf if phase is None else phase["out"]
+        out.write(text + "\n")
+    
+    def flush(self):
+        """Write buffered output to stdout in a single call"""
+        text = self._buf.getvalue()
+        raw = getattr(sys.stdout, "buffer", None)
+        if raw is None:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        else:
+            # Encode the whole phase once and bypass the text layer
+            sys.stdout.flush()
+            raw.write(text.encode(sys.stdout.encoding or "utf-8", errors="replace"))
+            raw.flush()
+        self._buf.seek(0)
+        self._buf.truncate(0)
+    
+    async def run_concurrently(self, *phases):
+        """Run independent test phases at once, then report them in the given order"""
+        async def capture(phase):
+            buffer = {"out": io.StringIO(), "results": [], "error": None}
+            _current_phase.set(buffer)
+            try:
+                await phase
+            except Exception as e:
+                # Hold the error until every phase's output has been merged
+                buffer["error"] = e
+            return buffer
+        
+        buffers = await asyncio.gather(*(capture(phase) for phase in phases))
+        for buffer in buffers:
+            self._buf.write(buffer["out"].getvalue())
+            for result in buffer["results"]:
+                self._record(result)
+        
+        for buffer in buffers:
+            if buffer["error"] is not None:
+                raise buffer["error"]
     
     def print_header(self, title: str):
         """Print formatted section header"""
-        print(f"\n{BLUE}{'='*60}{NC}")
-        print(f"{BLUE}{BOLD}{title}{NC}")
-        print(f"{BLUE}{'='*60}{NC}\n")
+        self.log(f"\n{BLUE}{'='*60}{NC}")
+        self.log(f"{BLUE}{BOLD}{title}{NC}")
+        self.log(f"{BLUE}{'='*60}{NC}\n")
     
     def print_test(self, name: str, passed: bool, details: str = ""):
         """Print test result"""
-        status = f"{GREEN}✅ PASSED{NC}" if passed else f"{RED}❌ FAILED{NC}"
-        print(f"  {name}: {status}")
+        self.log(f"  {name}: {PASSED if passed else FAILED}")
         if details:
-            print(f"    {CYAN}{details}{NC}")
-        self.test_results.append({"name": name, "passed": passed})
+            self.log(f"    {CYAN}{details}{NC}")
+        result = {"name": name, "passed": passed}
+        phase = _current_phase.get()
+        if phase is None:
+            self._record(result)
+        else:
+            phase["results"].append(result)
+    
+    def _record(self, result: Dict[str, Any]):
+        """Add a result and keep the summary counters current"""
+        self.test_results.append(result)
+        if result["passed"]:
+            self._passed_count += 1
+        else:
+            self._failed_names.append(result["name"])
     
     async def check_services(self) -> bool:
         """Check if all required services are running"""
@@ -71,25 +209,31 @@ class E2ETestSuite:
             ("MCP Wrapper", f"{MCP_URL}/health"),
         ]
         
-        for name, url in services:
-            try:
-                response = await self.client.get(url)
-                self.print_test(name, response.status_code == 200, f"Status: {response.status_code}")
-            except Exception as e:
-                self.print_test(name, False, f"Error: {e}")
+        # Probe every service at once with a short timeout so a dead one
+        # cannot stall the run; some servers reject HEAD with 405
+        probes = await asyncio.gather(
+            *(self.client.head(url, timeout=HEALTH_CHECK_TIMEOUT) for _, url in services),
+            return_exceptions=True
+        )
+        for (name, _), probe in zip(services, probes):
+            if isinstance(probe, Exception):
+                self.print_test(name, False, f"Error: {probe}")
                 all_healthy = False
+            else:
+                self.print_test(name, probe.status_code in (200, 405),
+                                f"Status: {probe.status_code}")
         
         # Check Vertex AI
         try:
-            result = subprocess.run(
-                ['gcloud', 'config', 'get-value', 'project'],
-                capture_output=True, text=True, check=True
-            )
-            is_vertex_ready = result.stdout.strip() == "water-futures-ai"
+            # Application Default Credentials resolve the project in-process,
+            # without spawning the gcloud CLI
+            import google.auth
+            _, project = google.auth.default()
+            is_vertex_ready = project == "water-futures-ai"
             self.print_test("Vertex AI", is_vertex_ready, 
                           "Project: water-futures-ai" if is_vertex_ready else "Not configured")
-        except:
-            self.print_test("Vertex AI", False, "gcloud not available")
+        except Exception:
+            self.print_test("Vertex AI", False, "Google Cloud credentials not available")
             all_healthy = False
         
         return all_healthy
@@ -98,53 +242,44 @@ class E2ETestSuite:
         """Test chat mode interactions"""
         self.print_header("2. CHAT MODE (SAFE) TESTING")
         
-        # Test 1: General conversation
-        print(f"{YELLOW}Test 2.1: General Conversation{NC}")
-        response = await self.client.post(
-            f"{BACKEND_URL}/api/v1/chat",
-            json={
+        # The three probes are read-only, so send them together. They still
+        # share the backend's conversation history, in arbitrary order
+        chat_url = self._chat_url
+        (_, general), (_, analysis), (_, result) = await asyncio.gather(
+            # Test 1: General conversation
+            self._request("POST", chat_url, json={
                 "message": "Hello, tell me about water futures",
                 "mode": "chat",
                 "context": self.session_context
-            }
-        )
-        
-        result = response.json()
-        has_response = bool(result.get("response"))
-        self.print_test("General chat response", has_response,
-                       f"Response length: {len(result.get('response', ''))} chars")
-        
-        # Test 2: Market analysis request
-        print(f"\n{YELLOW}Test 2.2: Market Analysis Request{NC}")
-        response = await self.client.post(
-            f"{BACKEND_URL}/api/v1/chat",
-            json={
+            }),
+            # Test 2: Market analysis request
+            self._request("POST", chat_url, json={
                 "message": "What's the forecast for water prices given the drought?",
                 "mode": "chat",
                 "context": self.session_context
-            }
+            }),
+            # Test 3: Trade request in chat mode (should not execute)
+            self._request("POST", chat_url, json={
+                "message": "Buy 10 NQH25 water futures contracts",
+                "mode": "chat",
+                "context": self.session_context
+            }),
         )
         
-        result = response.json()
-        mentions_drought = "drought" in result.get("response", "").lower()
-        mentions_price = any(word in result.get("response", "").lower() 
-                           for word in ["price", "forecast", "predict"])
+        self.log(f"{YELLOW}Test 2.1: General Conversation{NC}")
+        has_response = bool(general.get("response"))
+        self.print_test("General chat response", has_response,
+                       f"Response length: {len(general.get('response', ''))} chars")
+        
+        self.log(f"\n{YELLOW}Test 2.2: Market Analysis Request{NC}")
+        analysis_text = analysis.get("response", "").lower()
+        mentions_drought = "drought" in analysis_text
+        mentions_price = bool(PRICE_TERMS.search(analysis_text))
         
         self.print_test("Drought context recognized", mentions_drought)
         self.print_test("Price forecast mentioned", mentions_price)
         
-        # Test 3: Trade request in chat mode (should not execute)
-        print(f"\n{YELLOW}Test 2.3: Trade Request (Should Not Execute){NC}")
-        response = await self.client.post(
-            f"{BACKEND_URL}/api/v1/chat",
-            json={
-                "message": "Buy 10 NQH25 water futures contracts",
-                "mode": "chat",
-                "context": self.session_context
-            }
-        )
-        
-        result = response.json()
+        self.log(f"\n{YELLOW}Test 2.3: Trade Request (Should Not Execute){NC}")
         not_executed = not result.get("executed", False)
         suggests_agent = "agent mode" in result.get("response", "").lower()
         
@@ -157,61 +292,64 @@ class E2ETestSuite:
         """Test Vertex AI predictions"""
         self.print_header("3. VERTEX AI INTEGRATION")
         
-        # Test direct forecast endpoint
-        print(f"{YELLOW}Test 3.1: Direct Forecast API{NC}")
-        response = await self.client.post(
-            f"{BACKEND_URL}/api/v1/forecasts/predict",
-            json={
-                "contract_code": "NQH25",
-                "horizon_days": 7,
-                "include_confidence": True
-            }
+        (status, forecast), (signals_status, signals) = await asyncio.gather(
+            self._request(
+                "POST",
+                f"{BACKEND_URL}/api/v1/forecasts/predict",
+                json={
+                    "contract_code": "NQH25",
+                    "horizon_days": 7,
+                    "include_confidence": True
+                }
+            ),
+            self._request("GET", f"{BACKEND_URL}/api/v1/forecasts/signals"),
         )
         
-        if response.status_code == 200:
-            forecast = response.json()
-            has_predictions = bool(forecast.get("predicted_prices"))
+        # Test direct forecast endpoint
+        self.log(f"{YELLOW}Test 3.1: Direct Forecast API{NC}")
+        if status == 200:
+            # Only these fields are inspected; read each one once
+            predicted_prices = forecast.get("predicted_prices") or []
             using_vertex = forecast.get("using_vertex_ai", False)
-            has_confidence = forecast.get("model_confidence", 0) > 0
+            confidence = forecast.get("model_confidence", 0)
+            has_predictions = bool(predicted_prices)
+            has_confidence = confidence > 0
             
             self.print_test("Forecast generated", has_predictions,
-                          f"{len(forecast.get('predicted_prices', []))} days predicted")
+                          f"{len(predicted_prices)} days predicted")
             self.print_test("Using Vertex AI", using_vertex,
                           "Real model" if using_vertex else "Fallback model")
             self.print_test("Confidence score", has_confidence,
-                          f"{forecast.get('model_confidence', 0)*100:.0f}%")
+                          f"{confidence*100:.0f}%")
             
             if has_predictions:
                 current = forecast.get("current_price", 0)
-                future = forecast["predicted_prices"][-1]["price"]
+                future = predicted_prices[-1]["price"]
                 change = ((future - current) / current * 100) if current else 0
-                print(f"\n  {CYAN}Price Prediction:{NC}")
-                print(f"    Current: ${current:.2f}")
-                print(f"    7-day forecast: ${future:.2f}")
-                print(f"    Expected change: {change:+.1f}%")
+                self.log(f"\n  {CYAN}Price Prediction:{NC}")
+                self.log(f"    Current: ${current:.2f}")
+                self.log(f"    7-day forecast: ${future:.2f}")
+                self.log(f"    Expected change: {change:+.1f}%")
         else:
-            self.print_test("Forecast API", False, f"Status: {response.status_code}")
+            self.print_test("Forecast API", False, f"Status: {status}")
             forecast = {}
         
         # Test trading signals
-        print(f"\n{YELLOW}Test 3.2: Trading Signals with ML{NC}")
-        response = await self.client.get(f"{BACKEND_URL}/api/v1/forecasts/signals")
-        
-        if response.status_code == 200:
-            signals = response.json()
+        self.log(f"\n{YELLOW}Test 3.2: Trading Signals with ML{NC}")
+        if signals_status == 200:
             has_signals = signals.get("total_signals", 0) > 0
             self.print_test("Trading signals generated", has_signals,
                           f"{signals.get('total_signals', 0)} signals")
             
             if has_signals and signals.get("signals"):
                 signal = signals["signals"][0]
-                print(f"\n  {CYAN}Top Signal:{NC}")
-                print(f"    Contract: {signal.get('contract_code')}")
-                print(f"    Action: {signal.get('signal')} ({signal.get('strength')})")
-                print(f"    Confidence: {signal.get('confidence')}%")
-                print(f"    Model: {signal.get('model')}")
+                self.log(f"\n  {CYAN}Top Signal:{NC}")
+                self.log(f"    Contract: {signal.get('contract_code')}")
+                self.log(f"    Action: {signal.get('signal')} ({signal.get('strength')})")
+                self.log(f"    Confidence: {signal.get('confidence')}%")
+                self.log(f"    Model: {signal.get('model')}")
         else:
-            self.print_test("Trading signals", False, f"Status: {response.status_code}")
+            self.print_test("Trading signals", False, f"Status: {signals_status}")
         
         return forecast
     
@@ -219,54 +357,42 @@ class E2ETestSuite:
         """Test agent mode with real execution"""
         self.print_header("4. AGENT MODE (LIVE) TESTING")
         
-        # Test 1: Account check
-        print(f"{YELLOW}Test 4.1: Account Information{NC}")
-        response = await self.client.post(
-            f"{BACKEND_URL}/api/v1/agent/execute",
-            json={
+        agent_url = self._agent_url
+        (_, account), (_, forecast), (_, result) = await asyncio.gather(
+            # Test 1: Account check
+            self._request("POST", agent_url, json={
                 "message": "Check my account balance and positions",
                 "mode": "agent",
-                "context": {**self.session_context, "agentModeEnabled": True}
-            }
+                "context": self._agent_ctx
+            }),
+            # Test 2: Price forecast with Vertex AI
+            self._request("POST", agent_url, json={
+                "message": "Give me a forecast for NQH25 water futures",
+                "mode": "agent",
+                "context": self._agent_ctx
+            }),
+            # Test 3: Trade execution (simulated)
+            self._request("POST", agent_url, json={
+                "message": "Buy 3 NQH25 water futures contracts",
+                "mode": "agent",
+                "context": self._agent_ctx
+            }),
         )
         
-        result = response.json()
-        has_response = bool(result.get("response"))
-        executed = result.get("executed", False)
+        self.log(f"{YELLOW}Test 4.1: Account Information{NC}")
+        has_response = bool(account.get("response"))
+        executed = account.get("executed", False)
         
         self.print_test("Account check response", has_response)
         self.print_test("Tools executed", executed,
-                       f"Executed: {', '.join([str(d.get('tool', 'unknown')) for d in result.get('executionDetails', [])])}")
-        
-        # Test 2: Price forecast with Vertex AI
-        print(f"\n{YELLOW}Test 4.2: AI-Powered Price Forecast{NC}")
-        response = await self.client.post(
-            f"{BACKEND_URL}/api/v1/agent/execute",
-            json={
-                "message": "Give me a forecast for NQH25 water futures",
-                "mode": "agent",
-                "context": {**self.session_context, "agentModeEnabled": True}
-            }
-        )
+                       f"Executed: {', '.join([str(d.get('tool', 'unknown')) for d in account.get('executionDetails', [])])}")
         
-        result = response.json()
-        mentions_forecast = any(word in result.get("response", "").lower() 
-                              for word in ["forecast", "predict", "expect", "likely"])
+        self.log(f"\n{YELLOW}Test 4.2: AI-Powered Price Forecast{NC}")
+        mentions_forecast = bool(FORECAST_TERMS.search(forecast.get("response", "").lower()))
         self.print_test("Forecast in response", mentions_forecast)
         
-        # Test 3: Trade execution (simulated)
-        print(f"\n{YELLOW}Test 4.3: Trade Execution Flow{NC}")
-        response = await self.client.post(
-            f"{BACKEND_URL}/api/v1/agent/execute",
-            json={
-                "message": "Buy 3 NQH25 water futures contracts",
-                "mode": "agent",
-                "context": {**self.session_context, "agentModeEnabled": True}
-            }
-        )
-        
-        result = response.json()
-        trade_mentioned = "trade" in result.get("response", "").lower() or "order" in result.get("response", "").lower()
+        self.log(f"\n{YELLOW}Test 4.3: Trade Execution Flow{NC}")
+        trade_mentioned = bool(TRADE_TERMS.search(result.get("response", "").lower()))
         is_agent_action = result.get("isAgentAction", False)
         
         self.print_test("Trade response generated", trade_mentioned)
@@ -274,11 +400,11 @@ class E2ETestSuite:
         
         if result.get("executionDetails"):
             details = result["executionDetails"][0]
-            print(f"\n  {CYAN}Trade Details:{NC}")
-            print(f"    Success: {details.get('success', False)}")
-            print(f"    Order ID: {details.get('order_id', 'N/A')}")
-            print(f"    Symbol: {details.get('symbol', 'N/A')}")
-            print(f"    Quantity: {details.get('quantity', 'N/A')}")
+            self.log(f"\n  {CYAN}Trade Details:{NC}")
+            self.log(f"    Success: {details.get('success', False)}")
+            self.log(f"    Order ID: {details.get('order_id', 'N/A')}")
+            self.log(f"    Symbol: {details.get('symbol', 'N/A')}")
+            self.log(f"    Quantity: {details.get('quantity', 'N/A')}")
         
         return result
     
@@ -286,14 +412,25 @@ class E2ETestSuite:
         """Test government subsidy processing"""
         self.print_header("5. SUBSIDY PROCESSING (CROSSMINT)")
         
-        # Check eligibility
-        print(f"{YELLOW}Test 5.1: Check Subsidy Eligibility{NC}")
-        response = await self.client.get(
-            f"{BACKEND_URL}/api/v1/mcp/farmer/subsidies/{self.session_context['farmer_id']}"
+        (status, eligibility), (_, result) = await asyncio.gather(
+            self._request(
+                "GET",
+                f"{BACKEND_URL}/api/v1/mcp/farmer/subsidies/{self.session_context['farmer_id']}"
+            ),
+            self._request(
+                "POST",
+                self._agent_url,
+                json={
+                    "message": "Process my drought relief subsidy",
+                    "mode": "agent",
+                    "context": self._agent_ctx
+                }
+            ),
         )
         
-        if response.status_code == 200:
-            eligibility = response.json()
+        # Check eligibility
+        self.log(f"{YELLOW}Test 5.1: Check Subsidy Eligibility{NC}")
+        if status == 200:
             is_eligible = eligibility.get("eligible", False)
             total_available = eligibility.get("total_available", 0)
             
@@ -301,25 +438,15 @@ class E2ETestSuite:
                           f"Amount available: ${total_available:,}")
             
             if eligibility.get("programs"):
-                print(f"\n  {CYAN}Available Programs:{NC}")
+                self.log(f"\n  {CYAN}Available Programs:{NC}")
                 for program in eligibility["programs"]:
-                    print(f"    • {program['name']}: ${program['amount']:,}")
+                    self.log(f"    • {program['name']}: ${program['amount']:,}")
         else:
-            self.print_test("Eligibility check", False, f"Status: {response.status_code}")
+            self.print_test("Eligibility check", False, f"Status: {status}")
             eligibility = {}
         
         # Process subsidy claim
-        print(f"\n{YELLOW}Test 5.2: Process Subsidy Claim{NC}")
-        response = await self.client.post(
-            f"{BACKEND_URL}/api/v1/agent/execute",
-            json={
-                "message": "Process my drought relief subsidy",
-                "mode": "agent",
-                "context": {**self.session_context, "agentModeEnabled": True}
-            }
-        )
-        
-        result = response.json()
+        self.log(f"\n{YELLOW}Test 5.2: Process Subsidy Claim{NC}")
         subsidy_mentioned = "subsidy" in result.get("response", "").lower()
         self.print_test("Subsidy processing response", subsidy_mentioned)
         
@@ -338,64 +465,64 @@ class E2ETestSuite:
             ("Can I get government assistance?", "agent"),
         ]
         
-        print(f"{YELLOW}Simulating {len(conversation)}-step conversation:{NC}\n")
+        self.log(f"{YELLOW}Simulating {len(conversation)}-step conversation:{NC}\n")
         
-        for i, (message, mode) in enumerate(conversation, 1):
-            print(f"{MAGENTA}Step {i}: [{mode.upper()}] {message}{NC}")
-            
-            endpoint = f"{BACKEND_URL}/api/v1/{'agent/execute' if mode == 'agent' else 'chat'}"
-            response = await self.client.post(
-                endpoint,
-                json={
+        # Serialize every turn up front; the turns themselves are sent one at
+        # a time because the backend feeds each reply the shared conversation
+        # history, so later turns depend on the earlier ones
+        requests = [
+            (
+                self._agent_url if mode == "agent" else self._chat_url,
+                json_dumps({
                     "message": message,
                     "mode": mode,
-                    "context": {
-                        **self.session_context,
-                        "agentModeEnabled": mode == "agent"
-                    }
-                }
+                    "context": self._agent_ctx if mode == "agent" else self._chat_ctx
+                })
             )
+            for message, mode in conversation
+        ]
+        
+        for i, ((message, mode), (url, body)) in enumerate(zip(conversation, requests), 1):
+            self.log(f"{MAGENTA}Step {i}: [{mode.upper()}] {message}{NC}")
+            
+            status, result = await self._request("POST", url, content=body, headers=JSON_HEADERS)
             
-            if response.status_code == 200:
-                result = response.json()
+            if status == 200:
                 response_text = result.get("response", "")[:150] + "..."
-                print(f"  {GREEN}Response: {response_text}{NC}")
+                self.log(f"  {GREEN}Response: {response_text}{NC}")
                 
                 if result.get("executed"):
-                    print(f"  {CYAN}Executed: {result.get('actionType', 'unknown')} action{NC}")
+                    self.log(f"  {CYAN}Executed: {result.get('actionType', 'unknown')} action{NC}")
             else:
-                print(f"  {RED}Failed: Status {response.status_code}{NC}")
-            
-            await asyncio.sleep(1)  # Rate limiting
+                self.log(f"  {RED}Failed: Status {status}{NC}")
     
     def print_summary(self):
         """Print test summary"""
         self.print_header("TEST SUMMARY")
         
         total = len(self.test_results)
-        passed = sum(1 for t in self.test_results if t["passed"])
-        failed = total - passed
+        passed = self._passed_count
+        failed = len(self._failed_names)
         
-        print(f"{GREEN}Passed: {passed}/{total}{NC}")
-        print(f"{RED}Failed: {failed}/{total}{NC}")
+        self.log(f"{GREEN}Passed: {passed}/{total}{NC}")
+        self.log(f"{RED}Failed: {failed}/{total}{NC}")
         
         if failed > 0:
-            print(f"\n{RED}Failed Tests:{NC}")
-            for test in self.test_results:
-                if not test["passed"]:
-                    print(f"  • {test['name']}")
+            self.log(f"\n{RED}Failed Tests:{NC}")
+            for name in self._failed_names:
+                self.log(f"  • {name}")
         
         success_rate = (passed / total * 100) if total > 0 else 0
         
         if success_rate == 100:
-            print(f"\n{GREEN}{BOLD}🎉 ALL TESTS PASSED!{NC}")
-            print(f"{GREEN}The platform is fully operational with Vertex AI integration.{NC}")
+            self.log(f"\n{GREEN}{BOLD}🎉 ALL TESTS PASSED!{NC}")
+            self.log(f"{GREEN}The platform is fully operational with Vertex AI integration.{NC}")
         elif success_rate >= 80:
-            print(f"\n{YELLOW}⚠️ Most tests passed ({success_rate:.0f}%){NC}")
-            print(f"{YELLOW}Some features may need attention.{NC}")
+            self.log(f"\n{YELLOW}⚠️ Most tests passed ({success_rate:.0f}%){NC}")
+            self.log(f"{YELLOW}Some features may need attention.{NC}")
         else:
-            print(f"\n{RED}❌ Multiple failures detected ({success_rate:.0f}% pass rate){NC}")
-            print(f"{RED}Please check service configurations.{NC}")
+            self.log(f"\n{RED}❌ Multiple failures detected ({success_rate:.0f}% pass rate){NC}")
+            self.log(f"{RED}Please check service configurations.{NC}")
         
         return success_rate
 
@@ -408,25 +535,53 @@ async def main():
     print("╚═══════════════════════════════════════════════════════╝")
     print(f"{NC}")
     
-    async with E2ETestSuite() as suite:
-        # Check services first
-        if not await suite.check_services():
-            print(f"\n{RED}Some services are not running.{NC}")
-            print(f"{YELLOW}Run ./dev-start.sh to start all services.{NC}")
-            return 1
-        
-        # Run test suites
-        await suite.test_chat_mode()
-        await suite.test_vertex_ai_integration()
-        await suite.test_agent_mode()
-        await suite.test_subsidy_flow()
-        await suite.test_full_conversation_flow()
-        
-        # Print summary
-        success_rate = suite.print_summary()
-        
-        return 0 if success_rate == 100 else 1
+    try:
+        async with E2ETestSuite() as suite:
+            # Check services first
+            services_ok = await suite.check_services()
+            suite.flush()
+            if not services_ok:
+                print(f"\n{RED}Some services are not running.{NC}")
+                print(f"{YELLOW}Run ./dev-start.sh to start all services.{NC}")
+                return 1
+        
+            # The backend keeps one conversation history for chat and agent
+            # mode and feeds it back to Claude, so agent-mode messages must
+            # not land in the chat probes' context: run the chat phases
+            # first, then the agent phases. The forecast endpoints never touch
+            # that history. The conversation flow stays last
+            await suite.run_concurrently(
+                suite.test_chat_mode(),
+                suite.test_vertex_ai_integration(),
+            )
+            await suite.run_concurrently(
+                suite.test_agent_mode(),
+                suite.test_subsidy_flow(),
+            )
+            suite.flush()
+            await suite.test_full_conversation_flow()
+            suite.flush()
+        
+            # Print summary
+            success_rate = suite.print_summary()
+            suite.flush()
+        
+            return 0 if success_rate == 100 else 1
+    finally:
+        await close_client()
+
+def run(coro):
+    """Run a coroutine on uvloop when it is installed, else on the default loop"""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    if hasattr(uvloop, "run"):
+        return uvloop.run(coro)
+    # uvloop.run only exists from 0.18; older releases install a policy instead
+    uvloop.install()
+    return asyncio.run(coro)
 
 if __name__ == "__main__":
-    exit_code = asyncio.run(main())
+    exit_code = run(main())
     exit(exit_code)
\ No newline at end of file
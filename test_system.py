@@ -4,254 +4,312 @@ End-to-End System Test for Water Futures AI
 Tests all components: Claude, Alpaca, MCP, Frontend/Backend integration
 """
 import asyncio
+import enum
 import httpx
 import json
+import sys
+from collections import Counter
 from typing import Dict, Any
 import time
 
+class Status(enum.Enum):
+    """How a test is classified in the summary, independent of its display text"""
+    PASSED = "passed"
+    PARTIAL = "partial"
+    FAILED = "failed"
+
 class SystemTester:
+    # Summary order, independent of which test finishes first
+    ORDER = [
+        "Backend Health",
+        "Claude Chat",
+        "Agent Trading",
+        "Subsidy Processing",
+        "Market Analysis",
+        "Forecast",
+    ]
+    
     def __init__(self):
         self.backend_url = "http://localhost:8000"
-        self.test_results = []
+        self.test_results = {}
+        self.counts = Counter()
+        # One pooled client for every test instead of a new pool per call
+        self.client = httpx.AsyncClient(
+            base_url=self.backend_url,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
         
     async def run_all_tests(self):
         """Run all system tests"""
         print("🧪 Water Futures AI - System Test Suite")
         print("=" * 50)
         
-        # Test 1: Backend Health
-        await self.test_backend_health()
-        
-        # Test 2: Claude Chat Mode
-        await self.test_claude_chat()
-        
-        # Test 3: Agent Mode with Alpaca
-        await self.test_agent_trading()
-        
-        # Test 4: Subsidy Processing
-        await self.test_subsidy_processing()
-        
-        # Test 5: Market Analysis
-        await self.test_market_analysis()
+        try:
+            # The tests hit independent endpoints, so run them concurrently
+            # and report each one's output in the usual order afterwards
+            outcomes = await asyncio.gather(
+                self.test_backend_health(),     # Test 1
+                self.test_claude_chat(),        # Test 2
+                self.test_agent_trading(),      # Test 3
+                self.test_subsidy_processing(), # Test 4
+                self.test_market_analysis(),    # Test 5
+                self.test_forecast(),           # Test 6
+            )
+        finally:
+            await self.client.aclose()
         
-        # Test 6: Forecast
-        await self.test_forecast()
+        # Emit every test's log in one write rather than a print per line
+        lines = []
+        for test_name, status, result, log in outcomes:
+            lines.extend(log)
+            self.test_results[test_name] = (status, result)
+            self.counts[status] += 1
+        sys.stdout.write("\n".join(lines) + "\n")
         
         # Print results
         self.print_results()
     
     async def test_backend_health(self):
         """Test if backend is running"""
-        print("\n📍 Test 1: Backend Health Check")
+        log = ["\n📍 Test 1: Backend Health Check"]
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.backend_url}/health")
-                if response.status_code == 200:
-                    self.test_results.append(("Backend Health", "✅ PASSED"))
-                    print("  ✅ Backend is healthy")
-                else:
-                    self.test_results.append(("Backend Health", "❌ FAILED"))
-                    print(f"  ❌ Backend returned status {response.status_code}")
+            response = await self.client.get("/health")
+            if response.status_code == 200:
+                status, result = Status.PASSED, "✅ PASSED"
+                log.append("  ✅ Backend is healthy")
+            else:
+                status, result = Status.FAILED, "❌ FAILED"
+                log.append(f"  ❌ Backend returned status {response.status_code}")
         except Exception as e:
-            self.test_results.append(("Backend Health", f"❌ FAILED: {e}"))
-            print(f"  ❌ Backend not reachable: {e}")
+            status, result = Status.FAILED, f"❌ FAILED: {e}"
+            log.append(f"  ❌ Backend not reachable: {e}")
+        
+        return "Backend Health", status, result, log
     
     async def test_claude_chat(self):
         """Test Claude in chat mode"""
-        print("\n📍 Test 2: Claude Chat Mode")
+        log = ["\n📍 Test 2: Claude Chat Mode"]
         try:
-            async with httpx.AsyncClient() as client:
-                # Test general question
-                response = await client.post(
-                    f"{self.backend_url}/api/v1/chat",
-                    json={
-                        "message": "What government subsidies am I eligible for?",
-                        "context": {
-                            "location": "Central Valley",
-                            "droughtSeverity": 4
-                        }
+            # Test general question
+            response = await self.client.post(
+                "/api/v1/chat",
+                json={
+                    "message": "What government subsidies am I eligible for?",
+                    "context": {
+                        "location": "Central Valley",
+                        "droughtSeverity": 4
                     }
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if "response" in data and len(data["response"]) > 0:
-                        self.test_results.append(("Claude Chat", "✅ PASSED"))
-                        print("  ✅ Claude responded successfully")
-                        print(f"  Response preview: {data['response'][:100]}...")
-                    else:
-                        self.test_results.append(("Claude Chat", "⚠️ PARTIAL"))
-                        print("  ⚠️ Claude responded but content was empty")
+                }
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                if "response" in data and len(data["response"]) > 0:
+                    status, result = Status.PASSED, "✅ PASSED"
+                    log.append("  ✅ Claude responded successfully")
+                    log.append(f"  Response preview: {data['response'][:100]}...")
                 else:
-                    self.test_results.append(("Claude Chat", "❌ FAILED"))
-                    print(f"  ❌ Chat endpoint returned status {response.status_code}")
-                    
+                    status, result = Status.PARTIAL, "⚠️ PARTIAL"
+                    log.append("  ⚠️ Claude responded but content was empty")
+            else:
+                status, result = Status.FAILED, "❌ FAILED"
+                log.append(f"  ❌ Chat endpoint returned status {response.status_code}")
+                
         except Exception as e:
-            self.test_results.append(("Claude Chat", f"❌ FAILED: {e}"))
-            print(f"  ❌ Chat test failed: {e}")
+            status, result = Status.FAILED, f"❌ FAILED: {e}"
+            log.append(f"  ❌ Chat test failed: {e}")
+        
+        return "Claude Chat", status, result, log
     
     async def test_agent_trading(self):
         """Test Agent mode with Alpaca trading"""
-        print("\n📍 Test 3: Agent Mode - Alpaca Trading")
+        log = ["\n📍 Test 3: Agent Mode - Alpaca Trading"]
         try:
-            async with httpx.AsyncClient() as client:
-                # Test trade execution
-                response = await client.post(
-                    f"{self.backend_url}/api/v1/agent/execute",
-                    json={
-                        "message": "Buy 5 water futures contracts",
-                        "context": {
-                            "agentModeEnabled": True,
-                            "farmerId": "test-farmer"
-                        }
+            # Test trade execution
+            response = await self.client.post(
+                "/api/v1/agent/execute",
+                json={
+                    "message": "Buy 5 water futures contracts",
+                    "context": {
+                        "agentModeEnabled": True,
+                        "farmerId": "test-farmer"
                     }
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("executed") or "order" in data.get("response", "").lower():
-                        self.test_results.append(("Agent Trading", "✅ PASSED"))
-                        print("  ✅ Agent executed trade successfully")
-                        print(f"  Response: {data.get('response', '')[:100]}...")
-                    else:
-                        self.test_results.append(("Agent Trading", "⚠️ SIMULATED"))
-                        print("  ⚠️ Trade was simulated (Alpaca may not be connected)")
+                }
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                if data.get("executed") or "order" in data.get("response", "").lower():
+                    status, result = Status.PASSED, "✅ PASSED"
+                    log.append("  ✅ Agent executed trade successfully")
+                    log.append(f"  Response: {data.get('response', '')[:100]}...")
                 else:
-                    self.test_results.append(("Agent Trading", "❌ FAILED"))
-                    print(f"  ❌ Agent endpoint returned status {response.status_code}")
-                    
+                    status, result = Status.PARTIAL, "⚠️ SIMULATED"
+                    log.append("  ⚠️ Trade was simulated (Alpaca may not be connected)")
+            else:
+                status, result = Status.FAILED, "❌ FAILED"
+                log.append(f"  ❌ Agent endpoint returned status {response.status_code}")
+                
         except Exception as e:
-            self.test_results.append(("Agent Trading", f"❌ FAILED: {e}"))
-            print(f"  ❌ Agent trading test failed: {e}")
+            status, result = Status.FAILED, f"❌ FAILED: {e}"
+            log.append(f"  ❌ Agent trading test failed: {e}")
+        
+        return "Agent Trading", status, result, log
     
     async def test_subsidy_processing(self):
         """Test Crossmint subsidy processing"""
-        print("\n📍 Test 4: Subsidy Processing (Crossmint)")
+        log = ["\n📍 Test 4: Subsidy Processing (Crossmint)"]
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.backend_url}/api/v1/agent/execute",
-                    json={
-                        "message": "Process my drought relief subsidy payment",
-                        "context": {
-                            "agentModeEnabled": True,
-                            "farmerId": "test-farmer",
-                            "droughtSeverity": 4
-                        }
+            response = await self.client.post(
+                "/api/v1/agent/execute",
+                json={
+                    "message": "Process my drought relief subsidy payment",
+                    "context": {
+                        "agentModeEnabled": True,
+                        "farmerId": "test-farmer",
+                        "droughtSeverity": 4
                     }
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if "subsidy" in data.get("response", "").lower():
-                        self.test_results.append(("Subsidy Processing", "✅ PASSED"))
-                        print("  ✅ Subsidy processed successfully")
-                        print(f"  Response: {data.get('response', '')[:100]}...")
-                    else:
-                        self.test_results.append(("Subsidy Processing", "⚠️ PARTIAL"))
-                        print("  ⚠️ Subsidy response received but unclear")
+                }
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                if "subsidy" in data.get("response", "").lower():
+                    status, result = Status.PASSED, "✅ PASSED"
+                    log.append("  ✅ Subsidy processed successfully")
+                    log.append(f"  Response: {data.get('response', '')[:100]}...")
                 else:
-                    self.test_results.append(("Subsidy Processing", "❌ FAILED"))
-                    print(f"  ❌ Subsidy endpoint returned status {response.status_code}")
-                    
+                    status, result = Status.PARTIAL, "⚠️ PARTIAL"
+                    log.append("  ⚠️ Subsidy response received but unclear")
+            else:
+                status, result = Status.FAILED, "❌ FAILED"
+                log.append(f"  ❌ Subsidy endpoint returned status {response.status_code}")
+                
         except Exception as e:
-            self.test_results.append(("Subsidy Processing", f"❌ FAILED: {e}"))
-            print(f"  ❌ Subsidy test failed: {e}")
+            status, result = Status.FAILED, f"❌ FAILED: {e}"
+            log.append(f"  ❌ Subsidy test failed: {e}")
+        
+        return "Subsidy Processing", status, result, log
     
     async def test_market_analysis(self):
         """Test market analysis"""
-        print("\n📍 Test 5: Market Analysis")
+        log = ["\n📍 Test 5: Market Analysis"]
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.backend_url}/api/v1/chat",
-                    json={
-                        "message": "Analyze current water futures market conditions",
-                        "context": {}
-                    }
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if "market" in data.get("response", "").lower():
-                        self.test_results.append(("Market Analysis", "✅ PASSED"))
-                        print("  ✅ Market analysis provided")
-                    else:
-                        self.test_results.append(("Market Analysis", "⚠️ PARTIAL"))
-                        print("  ⚠️ Response received but no market data")
+            response = await self.client.post(
+                "/api/v1/chat",
+                json={
+                    "message": "Analyze current water futures market conditions",
+                    "context": {}
+                }
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                if "market" in data.get("response", "").lower():
+                    status, result = Status.PASSED, "✅ PASSED"
+                    log.append("  ✅ Market analysis provided")
                 else:
-                    self.test_results.append(("Market Analysis", "❌ FAILED"))
-                    
+                    status, result = Status.PARTIAL, "⚠️ PARTIAL"
+                    log.append("  ⚠️ Response received but no market data")
+            else:
+                status, result = Status.FAILED, "❌ FAILED"
+                
         except Exception as e:
-            self.test_results.append(("Market Analysis", f"❌ FAILED: {e}"))
-            print(f"  ❌ Market analysis test failed: {e}")
+            status, result = Status.FAILED, f"❌ FAILED: {e}"
+            log.append(f"  ❌ Market analysis test failed: {e}")
+        
+        return "Market Analysis", status, result, log
     
     async def test_forecast(self):
         """Test forecasting endpoint"""
-        print("\n📍 Test 6: Forecast Generation")
+        log = ["\n📍 Test 6: Forecast Generation"]
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.backend_url}/api/v1/forecasts/predict",
-                    json={
-                        "contract_code": "NQH25",
-                        "horizon_days": 7
-                    }
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if "predicted_prices" in data:
-                        self.test_results.append(("Forecast", "✅ PASSED"))
-                        print("  ✅ Forecast generated successfully")
-                        print(f"  Current price: ${data.get('current_price', 0)}")
-                        print(f"  Predictions: {len(data.get('predicted_prices', []))} days")
-                    else:
-                        self.test_results.append(("Forecast", "⚠️ PARTIAL"))
-                        print("  ⚠️ Forecast response incomplete")
+            response = await self.client.post(
+                "/api/v1/forecasts/predict",
+                json={
+                    "contract_code": "NQH25",
+                    "horizon_days": 7
+                }
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                if "predicted_prices" in data:
+                    status, result = Status.PASSED, "✅ PASSED"
+                    log.append("  ✅ Forecast generated successfully")
+                    log.append(f"  Current price: ${data.get('current_price', 0)}")
+                    log.append(f"  Predictions: {len(data.get('predicted_prices', []))} days")
                 else:
-                    self.test_results.append(("Forecast", "❌ FAILED"))
-                    
+                    status, result = Status.PARTIAL, "⚠️ PARTIAL"
+                    log.append("  ⚠️ Forecast response incomplete")
+            else:
+                status, result = Status.FAILED, "❌ FAILED"
+                
         except Exception as e:
-            self.test_results.append(("Forecast", f"❌ FAILED: {e}"))
-            print(f"  ❌ Forecast test failed: {e}")
+            status, result = Status.FAILED, f"❌ FAILED: {e}"
+            log.append(f"  ❌ Forecast test failed: {e}")
+        
+        return "Forecast", status, result, log
     
     def print_results(self):
         """Print test results summary"""
-        print("\n" + "=" * 50)
-        print("📊 TEST RESULTS SUMMARY")
-        print("=" * 50)
+        lines = [
+            "\n" + "=" * 50,
+            "📊 TEST RESULTS SUMMARY",
+            "=" * 50,
+        ]
         
-        passed = 0
-        failed = 0
-        partial = 0
+        for test_name in self.ORDER:
+            if test_name in self.test_results:
+                _, result = self.test_results[test_name]
+                lines.append(f"{test_name:25} {result}")
         
-        for test_name, result in self.test_results:
-            print(f"{test_name:25} {result}")
-            if "PASSED" in result:
-                passed += 1
-            elif "FAILED" in result:
-                failed += 1
-            else:
-                partial += 1
+        passed = self.counts[Status.PASSED]
+        partial = self.counts[Status.PARTIAL]
+        failed = self.counts[Status.FAILED]
         
-        print("=" * 50)
-        print(f"✅ Passed: {passed}")
-        print(f"⚠️  Partial: {partial}")
-        print(f"❌ Failed: {failed}")
-        print(f"📈 Success Rate: {(passed / len(self.test_results) * 100):.1f}%")
+        lines.append("=" * 50)
+        lines.append(f"✅ Passed: {passed}")
+        lines.append(f"⚠️  Partial: {partial}")
+        lines.append(f"❌ Failed: {failed}")
+        lines.append(f"📈 Success Rate: {(passed / len(self.test_results) * 100):.1f}%")
         
         if failed == 0:
-            print("\n🎉 All critical tests passed! System is ready.")
+            lines.append("\n🎉 All critical tests passed! System is ready.")
         else:
-            print(f"\n⚠️  {failed} tests failed. Please check the logs.")
+            lines.append(f"\n⚠️  {failed} tests failed. Please check the logs.")
+        
+        # One write for the whole summary instead of one per line
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+async def wait_for_health(client, path, max_wait=10.0, initial=0.1):
+    """Poll a health endpoint with exponential backoff until it returns 200"""
+    deadline = time.monotonic() + max_wait
+    delay = initial
+    while True:
+        # Bound each probe by the time left rather than the client's 30s timeout
+        remaining = deadline - time.monotonic()
+        try:
+            response = await client.get(path, timeout=max(remaining, 0.1))
+            if response.status_code == 200:
+                return True
+        except httpx.HTTPError:
+            pass
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(delay, remaining))
+        delay *= 2
 
 async def main():
     """Main test runner"""
     tester = SystemTester()
     
-    print("\n⏳ Waiting 3 seconds for services to be ready...")
-    await asyncio.sleep(3)
+    print("\n⏳ Waiting for services to be ready...")
+    if not await wait_for_health(tester.client, "/health", max_wait=10.0, initial=0.1):
+        print("  ⚠️ Backend did not report healthy in time, running tests anyway")
     
     await tester.run_all_tests()
     
@@ -265,4 +323,9 @@ async def main():
     print("7. Check Account page for transaction history")
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file
@@ -4,161 +4,183 @@ STRICT Vertex AI Test - ZERO TOLERANCE for fallbacks or dummy data
 This test will CRASH AND BURN if Vertex AI is not actually being used
 """
 
+import asyncio
 import sys
 import os
-import subprocess
-import json
-import tempfile
+import functools
+import mmap
+import re
+import reprlib
+import time
+
+from google.api_core import exceptions as google_exceptions
+from google.cloud import aiplatform
 
 # Force imports from backend
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 
+PROJECT_ID = "water-futures-ai"
+MONITORING_WINDOW_SECONDS = 3600
+
+# Words that hint at code paths which could bypass Vertex AI; "except" catches
+# exception handlers that might use fallback. One alternation scans a file once.
+FALLBACK_PATTERN = re.compile(rb"fallback|default|dummy|simulate|mock|except", re.IGNORECASE)
+
+# Previews the raw response without rendering every prediction in a large batch
+_preview = reprlib.Repr()
+_preview.maxlist = 20
+_preview.maxstring = 500
+
+# Test input with all 29 required features
+TEST_FEATURES = {
+    'Chino_Basin_eddi90d_lag_12': -0.8,
+    'Mojave_Basin_pdsi_lag_12': -1.5,
+    'California_Surface_Water_spi180d_lag_12': -1.0,
+    'Central_Basin_eddi1y_lag_12': -0.7,
+    'California_Surface_Water_spi90d_lag_12': -0.9,
+    'California_Surface_Water_spei1y_lag_12': -1.1,
+    'drought_composite_spi': -1.8,
+    'drought_composite_spei': -1.6,
+    'drought_composite_pdsi': -2.2,
+    'severe_drought_indicator': 1.0,
+    'extreme_drought_indicator': 1.0,
+    'drought_trend_4w': -0.4,
+    'drought_trend_8w': -0.6,
+    'nqh2o_lag_1': 450.0,
+    'nqh2o_lag_2': 445.0,
+    'nqh2o_lag_4': 440.0,
+    'price_momentum_4w': 0.03,
+    'price_momentum_8w': 0.06,
+    'price_volatility_4w': 20.0,
+    'price_volatility_8w': 25.0,
+    'price_vs_ma_4w': 0.02,
+    'price_vs_ma_12w': 0.04,
+    'month_sin': 0.866,
+    'month_cos': -0.5,
+    'week_sin': 0.707,
+    'week_cos': 0.707,
+    'is_drought_season': 1.0,
+    'is_wet_season': 0.0,
+    'time_trend': 2150.0
+}
+
+# Built once so repeated predictions reuse the same request instances
+TEST_INSTANCES = [TEST_FEATURES]
+
 RED = '\033[0;31m'
 GREEN = '\033[0;32m'
 YELLOW = '\033[1;33m'
 NC = '\033[0m'
 
-def test_vertex_directly_no_fallback():
+@functools.lru_cache(maxsize=None)
+def get_endpoint(endpoint_id, region):
+    """Initialise the SDK once per endpoint so repeat calls reuse auth and channel"""
+    aiplatform.init(project=PROJECT_ID, location=region)
+    return aiplatform.Endpoint(endpoint_id)
+
+async def test_vertex_directly_no_fallback():
     """
-    Make a DIRECT gcloud call to Vertex AI endpoint
+    Make a DIRECT call to the Vertex AI endpoint through the SDK
     This CANNOT use fallback data - it either works or fails
     """
-    print(f"\n{YELLOW}TESTING DIRECT VERTEX AI CALL - NO PYTHON, NO FALLBACKS{NC}\n")
-    
     endpoint_id = "7461517903041396736"
     region = "us-central1"
     
-    # Create test input with all 29 required features
-    test_features = {
-        'Chino_Basin_eddi90d_lag_12': -0.8,
-        'Mojave_Basin_pdsi_lag_12': -1.5,
-        'California_Surface_Water_spi180d_lag_12': -1.0,
-        'Central_Basin_eddi1y_lag_12': -0.7,
-        'California_Surface_Water_spi90d_lag_12': -0.9,
-        'California_Surface_Water_spei1y_lag_12': -1.1,
-        'drought_composite_spi': -1.8,
-        'drought_composite_spei': -1.6,
-        'drought_composite_pdsi': -2.2,
-        'severe_drought_indicator': 1.0,
-        'extreme_drought_indicator': 1.0,
-        'drought_trend_4w': -0.4,
-        'drought_trend_8w': -0.6,
-        'nqh2o_lag_1': 450.0,
-        'nqh2o_lag_2': 445.0,
-        'nqh2o_lag_4': 440.0,
-        'price_momentum_4w': 0.03,
-        'price_momentum_8w': 0.06,
-        'price_volatility_4w': 20.0,
-        'price_volatility_8w': 25.0,
-        'price_vs_ma_4w': 0.02,
-        'price_vs_ma_12w': 0.04,
-        'month_sin': 0.866,
-        'month_cos': -0.5,
-        'week_sin': 0.707,
-        'week_cos': 0.707,
-        'is_drought_season': 1.0,
-        'is_wet_season': 0.0,
-        'time_trend': 2150.0
-    }
-    
-    # Write to temp file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-        json.dump({"instances": [test_features]}, f)
-        temp_file = f.name
     
+    # Make the actual call in a worker thread; auth and the gRPC channel stay
+    # in-process. Everything is printed afterwards so concurrent checks
+    # report in whole sections.
     try:
-        print(f"Making DIRECT gcloud call to Vertex AI endpoint...")
-        print(f"Endpoint: {endpoint_id}")
-        print(f"Region: {region}")
-        
-        # Make the actual call
-        result = subprocess.run(
-            ['gcloud', 'ai', 'endpoints', 'predict', endpoint_id,
-             f'--region={region}',
-             f'--json-request={temp_file}'],
-            capture_output=True,
-            text=True,
-            timeout=30
+        prediction = await asyncio.to_thread(
+            lambda: get_endpoint(endpoint_id, region).predict(instances=TEST_INSTANCES, timeout=30)
         )
-        
-        if result.returncode != 0:
-            print(f"{RED}❌ VERTEX AI CALL FAILED!{NC}")
-            print(f"Error: {result.stderr}")
-            return None
-        
-        # Parse the response
-        output = result.stdout
+        error = None
+    except Exception as e:
+        prediction, error = None, e
+    
+    print(f"\n{YELLOW}TESTING DIRECT VERTEX AI CALL - NO BACKEND, NO FALLBACKS{NC}\n")
+    print(f"Made DIRECT SDK call to Vertex AI endpoint...")
+    print(f"Endpoint: {endpoint_id}")
+    print(f"Region: {region}")
+    
+    if isinstance(error, google_exceptions.DeadlineExceeded):
+        print(f"{RED}❌ Vertex AI call timed out - endpoint might be down{NC}")
+        return None
+    if error is not None:
+        print(f"{RED}❌ VERTEX AI CALL FAILED!{NC}")
+        print(f"Error: {error}")
+        return None
+    
+    try:
         print(f"\n{GREEN}RAW VERTEX AI RESPONSE:{NC}")
-        print(output[:500])
+        print(_preview.repr(prediction.predictions))
+        print(f"Deployed model: {prediction.deployed_model_id}")
         
         # Extract prediction value
-        import re
-        json_match = re.search(r'\[[\d\.\-]+\]', output)
+        prediction_value = prediction.predictions[0] if prediction.predictions else None
         
-        if json_match:
-            predictions = json.loads(json_match.group())
-            prediction_value = predictions[0] if predictions else None
-            
-            if prediction_value:
-                print(f"\n{GREEN}✅ REAL VERTEX AI PREDICTION: ${prediction_value:.2f}{NC}")
-                print(f"This is a REAL prediction from the deployed model")
-                print(f"Current price: $450.00")
-                print(f"Predicted change: ${prediction_value - 450:.2f} ({(prediction_value - 450)/450*100:+.1f}%)")
-                return prediction_value
-            else:
-                print(f"{RED}❌ No prediction value found{NC}")
-                return None
+        if prediction_value:
+            print(f"\n{GREEN}✅ REAL VERTEX AI PREDICTION: ${prediction_value:.2f}{NC}")
+            print(f"This is a REAL prediction from the deployed model")
+            print(f"Current price: $450.00")
+            print(f"Predicted change: ${prediction_value - 450:.2f} ({(prediction_value - 450)/450*100:+.1f}%)")
+            return prediction_value
         else:
-            print(f"{RED}❌ Could not parse Vertex AI response{NC}")
+            print(f"{RED}❌ No prediction value found{NC}")
             return None
             
-    except subprocess.TimeoutExpired:
-        print(f"{RED}❌ Vertex AI call timed out - endpoint might be down{NC}")
-        return None
     except Exception as e:
-        print(f"{RED}❌ Fatal error: {e}{NC}")
+        print(f"{RED}❌ VERTEX AI CALL FAILED!{NC}")
+        print(f"Error: {e}")
         return None
-    finally:
-        os.unlink(temp_file)
 
-def verify_no_fallback_in_code():
+def scan_one(filepath):
+    """
+    Return every line of a file that matches FALLBACK_PATTERN
+    The file is mapped and searched as bytes; line numbers come from offsets
+    """
+    found = []
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return found  # mmap cannot map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            line_no, counted_to, line_end = 1, 0, -1
+            for match in FALLBACK_PATTERN.finditer(mm):
+                start = match.start()
+                if start < line_end:
+                    continue  # this line is already reported
+                line_no += mm[counted_to:start].count(b'\n')
+                counted_to = start
+                line_start = mm.rfind(b'\n', 0, start) + 1
+                line_end = mm.find(b'\n', start)
+                if line_end == -1:
+                    line_end = len(mm)
+                found.append({
+                    'file': filepath,
+                    'line': line_no,
+                    'content': mm[line_start:line_end].decode('utf-8', 'replace').strip()
+                })
+    return found
+
+async def verify_no_fallback_in_code():
     """
     Check if the code has fallback logic that could bypass Vertex AI
     """
-    print(f"\n{YELLOW}CHECKING FOR FALLBACK CODE...{NC}\n")
-    
     files_to_check = [
         "backend/services/forecast_service_updated.py",
         "backend/services/nqh2o_prediction_service.py",
         "backend/services/vertex_ai_service.py"
     ]
     
-    fallback_patterns = [
-        "_fallback",
-        "fallback",
-        "default",
-        "dummy",
-        "simulate",
-        "mock",
-        "except",  # Exception handlers that might use fallback
-    ]
+    # Files are scanned in worker threads so reads overlap with regex work
+    results = await asyncio.gather(*(
+        asyncio.to_thread(scan_one, filepath)
+        for filepath in files_to_check
+        if os.path.exists(filepath)
+    ))
+    found_fallbacks = [fb for found in results for fb in found]
     
-    found_fallbacks = []
-    
-    for filepath in files_to_check:
-        if os.path.exists(filepath):
-            with open(filepath, 'r') as f:
-                content = f.read()
-                lines = content.split('\n')
-                
-                for i, line in enumerate(lines, 1):
-                    for pattern in fallback_patterns:
-                        if pattern in line.lower():
-                            found_fallbacks.append({
-                                'file': filepath,
-                                'line': i,
-                                'content': line.strip()
-                            })
+    print(f"\n{YELLOW}CHECKING FOR FALLBACK CODE...{NC}\n")
     
     if found_fallbacks:
         print(f"{RED}⚠️ FOUND {len(found_fallbacks)} POTENTIAL FALLBACK POINTS:{NC}")
@@ -170,37 +192,54 @@ def verify_no_fallback_in_code():
     
     return len(found_fallbacks) == 0
 
-def check_vertex_monitoring():
+def fetch_prediction_metrics():
+    """Return True if Cloud Monitoring has recent Vertex AI prediction counts"""
+    from google.cloud import monitoring_v3
+    
+    client = monitoring_v3.MetricServiceClient()
+    now = int(time.time())
+    interval = monitoring_v3.TimeInterval({
+        "end_time": {"seconds": now},
+        "start_time": {"seconds": now - MONITORING_WINDOW_SECONDS},
+    })
+    series = client.list_time_series(
+        request={
+            "name": f"projects/{PROJECT_ID}",
+            "filter": 'metric.type="aiplatform.googleapis.com/prediction/online/prediction_count"',
+            "interval": interval,
+            "view": monitoring_v3.ListTimeSeriesRequest.TimeSeriesView.HEADERS,
+        },
+        timeout=10,
+    )
+    return next(iter(series), None) is not None
+
+async def check_vertex_monitoring():
     """
     Check Vertex AI monitoring metrics to see if it's receiving requests
     """
+    # Get monitoring data
+    try:
+        has_data, error = await asyncio.to_thread(fetch_prediction_metrics), None
+    except Exception as e:
+        has_data, error = False, e
+    
     print(f"\n{YELLOW}CHECKING VERTEX AI MONITORING...{NC}\n")
     
-    try:
-        # Get monitoring data
-        result = subprocess.run([
-            'gcloud', 'monitoring', 'time-series', 'list',
-            '--filter=metric.type="aiplatform.googleapis.com/prediction/online/prediction_count"',
-            '--format=json',
-            '--project=water-futures-ai'
-        ], capture_output=True, text=True, timeout=10)
-        
-        if result.returncode == 0 and result.stdout:
-            data = json.loads(result.stdout)
-            if data:
-                print(f"{GREEN}✅ Found monitoring data - Vertex AI is receiving requests{NC}")
-                return True
-            else:
-                print(f"{YELLOW}⚠️ No recent prediction metrics found{NC}")
-                return False
-        else:
-            print(f"{YELLOW}Could not fetch monitoring data{NC}")
-            return False
-    except:
-        print(f"{YELLOW}Monitoring check skipped{NC}")
+    if isinstance(error, ImportError):
+        print(f"{YELLOW}Monitoring check skipped (google-cloud-monitoring not installed){NC}")
+        return False
+    if error is not None:
+        print(f"{YELLOW}Could not fetch monitoring data{NC}")
+        return False
+    
+    if has_data:
+        print(f"{GREEN}✅ Found monitoring data - Vertex AI is receiving requests{NC}")
+        return True
+    else:
+        print(f"{YELLOW}⚠️ No recent prediction metrics found{NC}")
         return False
 
-def main():
+async def main():
     print(f"\n{RED}{'='*60}{NC}")
     print(f"{RED}STRICT VERTEX AI TEST - ZERO TOLERANCE{NC}")
     print(f"{RED}{'='*60}{NC}")
@@ -209,14 +248,15 @@ def main():
     print(f"  • Any fallback or dummy data is used")
     print(f"  • The model endpoint is not responding")
     
-    # Test 1: Direct Vertex AI call
-    prediction = test_vertex_directly_no_fallback()
-    
-    # Test 2: Check for fallback code
-    no_fallbacks = verify_no_fallback_in_code()
-    
-    # Test 3: Check monitoring
-    has_metrics = check_vertex_monitoring()
+    # The three checks are independent, so run them together:
+    #   1. Direct Vertex AI call
+    #   2. Check for fallback code
+    #   3. Check monitoring
+    prediction, no_fallbacks, has_metrics = await asyncio.gather(
+        test_vertex_directly_no_fallback(),
+        verify_no_fallback_in_code(),
+        check_vertex_monitoring(),
+    )
     
     # Final verdict
     print(f"\n{RED}{'='*60}{NC}")
@@ -246,5 +286,5 @@ def main():
         return 1
 
 if __name__ == "__main__":
-    exit_code = main()
+    exit_code = asyncio.run(main())
     sys.exit(exit_code)
\ No newline at end of file
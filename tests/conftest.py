@@ -0,0 +1,57 @@
+"""
+Shared fixtures for the end-to-end tests
+"""
+
+import os
+
+import pytest
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+
+# Tests use explicit waits; this only bounds a navigation that never finishes
+PAGE_LOAD_TIMEOUT = 15
+
+# The UI tests never look at pixels, so skip downloading images and fonts
+BLOCKED_URLS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.woff", "*.woff2", "*.ttf"]
+
+
+@pytest.fixture(scope="session")
+def driver():
+    """One browser per test session (per worker under pytest-xdist)"""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless=new")  # Run in headless mode for CI
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.images": 2,
+    })
+
+    # CHROMEDRIVER pins a driver binary; otherwise Selenium Manager resolves
+    # one from its on-disk cache
+    service = Service(executable_path=os.environ.get("CHROMEDRIVER"))
+
+    try:
+        browser = webdriver.Chrome(service=service, options=chrome_options)
+    except (WebDriverException, FileNotFoundError):
+        # Fallback to Firefox if Chrome not available
+        firefox_options = FirefoxOptions()
+        firefox_options.add_argument("--headless")
+        browser = webdriver.Firefox(options=firefox_options)
+
+    if hasattr(browser, "execute_cdp_cmd"):
+        browser.execute_cdp_cmd("Network.enable", {})
+        browser.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+
+    # Explicit waits only: an implicit wait would add its own polling to
+    # every find_element on top of them
+    browser.implicitly_wait(0)
+    browser.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+
+    yield browser
+    browser.quit()